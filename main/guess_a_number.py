@@ -8,7 +8,8 @@ import sys
 from cmd import Cmd
 from collections import Counter
 from itertools import product, permutations
-from random import choice
+from random import choice, sample
+from time import monotonic
 from typing import Tuple, List, Union
 
 
@@ -24,6 +25,7 @@ class SuperHirn(Cmd):
         'pins': 4,
         'limit': 12,
         'repeat': True,
+        'budget': 2,
     }
     defaults = {k: v for k, v in settings.items()}
 
@@ -47,9 +49,13 @@ class SuperHirn(Cmd):
     game_over = False
     cracked = False
 
+    chunk_size = 4096
+    progress_delay = 0.5
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.possible_codes = self.calculate_possible_codes()
+        self.progress = self.show_progress
 
     def emptyline(self) -> bool:
         return False
@@ -57,6 +63,14 @@ class SuperHirn(Cmd):
     def precmd(self, line: str) -> str:
         return line.lower()
 
+    def onecmd(self, line: str) -> bool:
+        try:
+            return super().onecmd(line)
+        except KeyboardInterrupt:
+            print('^C')
+            print('+ Command cancelled. Session status unchanged.')
+            return self.CONTINUE
+
     def got_arguments(self, arg: str) -> bool:
         return bool(len(arg))
 
@@ -177,11 +191,13 @@ class SuperHirn(Cmd):
 
     def help_set(self) -> None:
         for line in [
-            'Set the game parameters: "set colors|pins|limit|repeat <value>", where ...',
+            'Set the game parameters: "set colors|pins|limit|repeat|budget <value>", where ...',
             '- "colors" is the permitted number of code colors: 6 <= value <= 9, default 8',
             '- "pins" is the permitted number of code pins: value in {4, 5}, default 4',
             '- "limit" is the maximum number of guesses: value in {10, 12}, default 12',
             '- "repeat" says if clors may be repeated in codes or not: value is true or false, default true',
+            '- "budget" is the time limit for the codebreaker to search the next guess:',
+            '  0 <= value <= 60 seconds, with 0 meaning "pick any remaining code", default 2',
         ]: print(line)
 
     def do_set(self, arg: str) -> bool:
@@ -193,17 +209,19 @@ class SuperHirn(Cmd):
         key, value = self.argv_is_key_value_pair(argv)
         if key is None:
             return self.wrong_argument_type_hint()
-        self.settings[key] = value
-        self.possible_codes = self.calculate_possible_codes()
+        settings = {**self.settings, key: value}
+        possible_codes = self.calculate_possible_codes(settings)
+        self.settings, self.possible_codes = settings, possible_codes
         return self.CONTINUE
 
     def do_reset(self, arg):
         """Reset session status and set game defaults."""
         if self.got_arguments(arg):
             return self.arguments_not_expected_help_hint()
+        settings = {k: v for k, v in self.defaults.items()}
+        possible_codes = self.calculate_possible_codes(settings)
         self.session_mode = None
-        self.settings = {k: v for k, v in self.defaults.items()}
-        self.possible_codes = self.calculate_possible_codes()
+        self.settings, self.possible_codes = settings, possible_codes
         self.remaining_codes = None
         self.secret_code = None
         self.guesses = 0
@@ -241,6 +259,8 @@ class SuperHirn(Cmd):
                 print(f'+ Maximum allowed guesses for codebreaking are {value}.')
             elif setting == 'repeat':
                 print(f'+ Code colors may{" " if value else " not "}be repeated.')
+            elif setting == 'budget':
+                print(f'+ Codebreaker searches {value} seconds at most for the next guess.')
         print(f'+ With this settings there are {len(self.possible_codes)} codes possible to make.')
 
     def show_all(self) -> None:
@@ -343,8 +363,8 @@ class SuperHirn(Cmd):
         answer = self.got_valid_feedback_string(arg)
         if answer is None:
             return self.wrong_arguments_help_hint()
-        self.guesses += 1
         self.remaining_codes = self.calculate_remaining_codes(self.secret_code, answer)
+        self.guesses += 1
         self.board.append((self.guesses, self.secret_code, answer))
         self.show_board()
         if answer == '+' * self.settings['pins']:
@@ -354,8 +374,11 @@ class SuperHirn(Cmd):
         elif self.guesses >= self.settings['limit'] and answer != '+' * self.settings['pins']:
             self.game_over = True
             print('+ Too many guesses. Secret code not cracked. Game over.')
+        elif not self.remaining_codes:
+            self.game_over = True
+            print('+ No code fits all the feedbacks. Please check the board. Game over.')
         else:
-            self.secret_code = choice(self.remaining_codes)
+            self.secret_code = self.calculate_next_guess()
             print(f'+ Next guess: {self.secret_code}.')
         return self.CONTINUE
 
@@ -368,22 +391,67 @@ class SuperHirn(Cmd):
         self.remaining_codes = self.possible_codes[:]
         self.session_mode = 'codebreaker'
         print(f'+ Now in {self.session_mode} mode.')
-        self.secret_code = choice(self.remaining_codes)
+        self.secret_code = self.calculate_next_guess()
         print(f'+ First guess: {self.secret_code}. Ready for feedbacks.')
         return self.do_show('settings')
 
-    def calculate_possible_codes(self) -> List[Tuple[int, ...]]:
+    def calculate_possible_codes(self, settings: dict = None) -> List[Tuple[int, ...]]:
+        settings = settings or self.settings
         return {
             True: lambda c, p: list(product(range(c), repeat=p)),
             False: lambda c, p: list(permutations(range(c), p)),
-        }[self.settings['repeat']](self.settings['colors'], self.settings['pins'])
+        }[settings['repeat']](settings['colors'], settings['pins'])
 
     def calculate_remaining_codes(self, guess: Tuple[int, ...], feedback: str) -> List[Tuple[int, ...]]:
-        return [
-            code
-            for code in self.remaining_codes
-            if self.score(code, guess) == feedback and code != guess
-        ]
+        remaining_codes = []
+        total = len(self.remaining_codes)
+        for start in range(0, total, self.chunk_size):
+            remaining_codes.extend(
+                code
+                for code in self.remaining_codes[start:start + self.chunk_size]
+                if self.score(code, guess) == feedback and code != guess
+            )
+            if total > self.chunk_size:
+                self.progress('Filtering codes', min(start + self.chunk_size, total) / total)
+        return remaining_codes
+
+    def calculate_next_guess(self) -> Tuple[int, ...]:
+        """Pick the remaining code that leaves the fewest codes in the worst case, as far as the budget allows."""
+        best_guess, best_worst_case = choice(self.remaining_codes), len(self.remaining_codes)
+        if not self.settings['budget'] or len(self.remaining_codes) <= 2:
+            return best_guess
+        budget, started = self.settings['budget'], monotonic()
+        candidates = sample(self.remaining_codes, len(self.remaining_codes))
+        step = max(1, self.chunk_size // len(self.remaining_codes))
+        checked, shown = 0, False
+        try:
+            for guess in candidates:
+                worst_case = max(Counter(self.score(code, guess) for code in self.remaining_codes).values())
+                checked += 1
+                if worst_case < best_worst_case:
+                    best_guess, best_worst_case = guess, worst_case
+                elapsed = monotonic() - started
+                if elapsed > budget:
+                    break
+                if checked % step == 0 and elapsed >= self.progress_delay:
+                    # whatever comes first: all guesses checked or the budget used up
+                    self.progress('Searching next guess', max(checked / len(candidates), elapsed / budget))
+                    shown = True
+        except KeyboardInterrupt:
+            print('^C')
+            print('+ Search cancelled.', end=' ')
+        else:
+            if shown:
+                self.progress('Searching next guess', 1.0)
+            if checked < len(candidates):
+                print('+ Search budget used up.', end=' ')
+        if checked < len(candidates):
+            print(f'Best of {checked} guesses checked leaves {best_worst_case} codes at most.')
+        return best_guess
+
+    def show_progress(self, task: str, fraction: float) -> None:
+        """The default progress hook. Replace the progress attribute to report elsewhere."""
+        print(f'\r+ {task}: {int(fraction * 100):3}%', end='\n' if fraction >= 1 else '', flush=True)
 
     def settings_help_hint(self) -> bool:
         command = self.lastcmd.split()[0]
@@ -424,6 +492,8 @@ class SuperHirn(Cmd):
             return k, int(v)
         elif k == 'repeat' and v in ('true', 'false'):
             return k, v == 'true'
+        elif k == 'budget' and v in [str(n) for n in range(61)]:
+            return k, int(v)
         else:
             return None, None
 
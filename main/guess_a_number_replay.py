@@ -0,0 +1,238 @@
+"""
+Mastermind Game Play: Replay
+
+Replays recorded games from log files, one game after the other, without loading whole files.
+
+Log format:
+- a game starts with a settings line: "game colors=8 pins=4 limit=12 repeat=true",
+  settings not given fall back to the defaults
+- every following line is one move: the guess digits, then the feedback, e.g. "1 2 3 4 o+",
+  with "-" meaning "no score", like the feedback command of the interactive shell
+- empty lines and lines starting with "#" are ignored
+
+Settings are limited to 1 <= colors <= 10, as every color is a single digit, and to 1 <= pins <= 5.
+A game with bad settings is counted as a game with problems, and its moves are skipped.
+A game with a bad move is replayed up to that move and counted as a game with problems,
+and the moves after it are skipped. So is a game that goes on after the code was cracked.
+"""
+import sys
+from argparse import ArgumentParser
+from collections import Counter
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import product, permutations
+from math import log2
+from operator import eq
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# feedback
+RIGHT_COLOR = 'o'
+RIGHT_COLOR_AND_POSITION = '+'
+NO_SCORE = '-'
+
+# game log keywords
+GAME = 'game'
+COMMENT = '#'
+
+DEFAULTS = {
+    'colors': 8,
+    'pins': 4,
+    'limit': 12,
+    'repeat': True,
+}
+
+DIGITS = '0123456789'
+MAX_COLORS = 10
+MAX_PINS = 5
+
+Settings = Dict[str, Union[int, bool]]
+Move = Tuple[int, Tuple[int, ...], str]
+Problem = Union[None, Tuple[int, str]]
+Game = Tuple[int, Union[None, Settings], List[Move], Problem]
+
+
+@lru_cache(maxsize=4)
+def possible_codes(colors: int, pins: int, repeat: bool) -> Tuple[Tuple[int, ...], ...]:
+    return {
+        True: lambda c, p: tuple(product(range(c), repeat=p)),
+        False: lambda c, p: tuple(permutations(range(c), p)),
+    }[repeat](colors, pins)
+
+
+def compare_codes(a: Tuple[int, ...], b: Tuple[int, ...]) -> str:
+    if len(a) != len(b):
+        raise ValueError('Can not compare iterables of different length.')
+    right_position = sum(map(eq, a, b))
+    right_color, unmatched = 0, list(b)
+    for x in a:
+        if x in unmatched:
+            unmatched.remove(x)
+            right_color += 1
+    return RIGHT_COLOR * (right_color - right_position) + RIGHT_COLOR_AND_POSITION * right_position
+
+
+@lru_cache(maxsize=8)
+def first_remaining_codes(colors: int, pins: int, repeat: bool,
+                          guess: Tuple[int, ...], feedback: str) -> Tuple[Tuple[int, ...], ...]:
+    # many games start with the same few openings, so the filtering of the full code set is done once per first move
+    return tuple(code for code in possible_codes(colors, pins, repeat) if compare_codes(code, guess) == feedback)
+
+
+def is_number(arg: str) -> bool:
+    return arg != '' and all(ch in DIGITS for ch in arg)
+
+
+def parse_settings(argv: List[str]) -> Union[None, Settings]:
+    settings = {k: v for k, v in DEFAULTS.items()}
+    for arg in argv:
+        k, _, v = arg.partition('=')
+        if k not in settings:
+            return None
+        if k == 'repeat' and v in ('true', 'false'):
+            settings[k] = v == 'true'
+        elif k != 'repeat' and is_number(v) and int(v) > 0:
+            settings[k] = int(v)
+        else:
+            return None
+    if not settings['colors'] <= MAX_COLORS or not settings['pins'] <= MAX_PINS:
+        return None
+    if not settings['repeat'] and settings['pins'] > settings['colors']:
+        return None
+    return settings
+
+
+def parse_feedback(arg: str) -> Union[None, str]:
+    if arg == NO_SCORE:
+        return ''
+    if not arg or any(ch not in RIGHT_COLOR + RIGHT_COLOR_AND_POSITION for ch in arg):
+        return None
+    answer_pins = Counter(arg)
+    return RIGHT_COLOR * answer_pins[RIGHT_COLOR] + RIGHT_COLOR_AND_POSITION * answer_pins[RIGHT_COLOR_AND_POSITION]
+
+
+def parse_move(argv: List[str]) -> Union[None, Tuple[Tuple[int, ...], str]]:
+    if len(argv) < 2 or not all(is_number(d) for d in argv[:-1]):
+        return None
+    feedback = parse_feedback(argv[-1])
+    if feedback is None:
+        return None
+    return tuple(int(d) for d in argv[:-1]), feedback
+
+
+def read_games(lines: Iterable[str]) -> Iterator[Game]:
+    """Yield one game at a time as (line number, settings, moves, problem), with settings None if bad.
+
+    A move outside of a game is yielded as a game with line number 0.
+    """
+    start, settings, moves, problem, skipped = 0, None, [], None, 0
+
+    def game() -> Game:
+        if skipped:
+            return start, settings, moves, (problem[0], f'{problem[1]} ({skipped} moves after it skipped)')
+        return start, settings, moves, problem
+
+    for line_no, line in enumerate(lines, 1):
+        argv = line.lower().split()
+        if not argv or argv[0].startswith(COMMENT):
+            continue
+        if argv[0] == GAME:
+            if start:
+                yield game()
+            start, settings, moves, problem, skipped = line_no, parse_settings(argv[1:]), [], None, 0
+            if settings is None:
+                problem = line_no, f'bad settings: {line.strip()}'
+            continue
+        if not start:
+            yield 0, None, [], (line_no, 'move outside of a game')
+            continue
+        if problem is not None:
+            skipped += 1
+            continue
+        move = parse_move(argv)
+        if move is None:
+            problem = line_no, f'bad move: {line.strip()}'
+            continue
+        moves.append((line_no, *move))
+    if start:
+        yield game()
+
+
+def replay(settings: Union[None, Settings], moves: List[Move]) -> Iterator[Tuple[Move, int, int, str]]:
+    """Yield (move, remaining before, remaining after, problem) for every move, stop at the first problem."""
+    if settings is None:
+        return
+    pins = settings['pins']
+    remaining_codes = possible_codes(settings['colors'], pins, settings['repeat'])
+    for n, move in enumerate(moves, 1):
+        line_no, guess, feedback = move
+        before = len(remaining_codes)
+        if len(guess) != pins or any(d >= settings['colors'] for d in guess):
+            yield move, before, before, f'guess {guess} does not fit the settings'
+            return
+        if len(feedback) > pins:
+            yield move, before, before, f'feedback "{feedback}" has more than {pins} pins'
+            return
+        if n > settings['limit']:
+            yield move, before, before, f'more than {settings["limit"]} guesses'
+            return
+        if n == 1:
+            remaining_codes = first_remaining_codes(settings['colors'], pins, settings['repeat'], guess, feedback)
+        else:
+            remaining_codes = [code for code in remaining_codes if compare_codes(code, guess) == feedback]
+        if not remaining_codes:
+            yield move, before, 0, 'inconsistent feedback, no code left'
+            return
+        yield move, before, len(remaining_codes), ''
+        if feedback == RIGHT_COLOR_AND_POSITION * pins:
+            if n < len(moves):
+                yield moves[n], 1, 1, 'move after the code was cracked'
+            return
+
+
+def run(files: List[str], *, verbose: bool = False) -> int:
+    games = solved = bad = 0
+    total_gain = 0.0
+    for file in files:
+        with (nullcontext(sys.stdin) if file == '-' else open(file)) as lines:
+            for start, settings, moves, problem in read_games(lines):
+                if not start:
+                    bad += 1
+                    print(f'{file}:{problem[0]}: *** {problem[1]}')
+                    continue
+                games += 1
+                cracked, rounds = False, 0
+                for (line_no, guess, feedback), before, after, replay_problem in replay(settings, moves):
+                    if replay_problem:
+                        problem = line_no, replay_problem
+                        break
+                    rounds += 1
+                    gain = log2(before / after)
+                    total_gain += gain
+                    cracked = feedback == RIGHT_COLOR_AND_POSITION * settings['pins']
+                    if verbose:
+                        print(f'{rounds}: {guess} -> {feedback or NO_SCORE:5} '
+                              f'| remaining choices: {after:5} | gain: {gain:.2f} bits')
+                if problem:
+                    bad += 1
+                    print(f'{file}:{problem[0]}: *** {problem[1]}')
+                elif cracked:
+                    solved += 1
+                print(f'{file}:{start}: {rounds} moves, '
+                      f'{"with problems" if problem else "cracked" if cracked else "not cracked"}')
+    print(f'Replayed {games} games: {solved} cracked, {bad} with problems, '
+          f'{total_gain / max(games, 1):.2f} bits gained per game.')
+    return bad
+
+
+def parse_args():
+    parser = ArgumentParser(description='Replay recorded games like a mastermind!', usage='%(prog)s [options]')
+    parser.add_argument('files', nargs='*', default=['-'], help='game log files (default = stdin)')
+    parser.add_argument('--verbose', action='store_true', help='show every move with its information gain')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    sys.exit(1 if run(args.files, verbose=args.verbose) else 0)
+
+# last line of code
@@ -0,0 +1,262 @@
+"""
+Mastermind Game Play: Settings Sweep
+
+Lets the machine crack every secret code for a whole grid of settings, and reports how many guesses it took.
+
+The work is split into units (settings, range of secret codes) and handed out to worker processes,
+which connect to the coordinator over a plain TCP socket and talk in lines of JSON:
+- coordinator to worker: {"unit": 7, "colors": 8, "pins": 4, "repeat": true, "start": 0, "stop": 500}
+- worker to coordinator: {"unit": 7, "rounds": {"4": 120, "5": 380}}
+If a worker goes away, sends a bad line, or does not answer in time, its unit is handed out to another worker again.
+
+Workers are started on the local machine by default. More workers may join from elsewhere:
+"%(prog)s --worker <host>:<port>".
+"""
+import json
+import selectors
+import socket
+import subprocess
+import sys
+from argparse import ArgumentParser
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import product, permutations
+from math import factorial
+from random import Random
+from time import monotonic
+from typing import Dict, List, Tuple
+
+# feedback
+RIGHT_COLOR = 'o'
+RIGHT_COLOR_AND_POSITION = '+'
+
+# strategies
+RANDOM = 'random'
+FIRST = 'first'
+
+LOCALHOST = '127.0.0.1'
+BUFSIZE = 65536
+
+Unit = Dict[str, object]
+
+
+@lru_cache(maxsize=2)
+def possible_codes(colors: int, pins: int, repeat: bool) -> Tuple[Tuple[int, ...], ...]:
+    return {
+        True: lambda c, p: tuple(product(range(c), repeat=p)),
+        False: lambda c, p: tuple(permutations(range(c), p)),
+    }[repeat](colors, pins)
+
+
+def compare_codes(a: Tuple[int, ...], b: Tuple[int, ...]) -> str:
+    if len(a) != len(b):
+        raise ValueError('Can not compare iterables of different length.')
+    result = RIGHT_COLOR * sum((Counter(a) & Counter(b)).values())
+    for x, y in zip(a, b):
+        if x == y:
+            result = result[1:] + RIGHT_COLOR_AND_POSITION
+    return result
+
+
+def crack(secret_code: Tuple[int, ...], codes: Tuple[Tuple[int, ...], ...], pick) -> int:
+    rounds = 0
+    feedback = ''
+    remaining_codes = codes
+    while feedback != RIGHT_COLOR_AND_POSITION * len(secret_code):
+        guess = pick(remaining_codes)
+        rounds += 1
+        feedback = compare_codes(secret_code, guess)
+        remaining_codes = [code for code in remaining_codes if compare_codes(code, guess) == feedback]
+    return rounds
+
+
+def work(unit: Unit, strategy: str) -> Unit:
+    codes = possible_codes(unit['colors'], unit['pins'], unit['repeat'])
+    rounds = Counter()
+    for n in range(unit['start'], unit['stop']):
+        # seeded by settings and secret code, so a reassigned unit gives the same result
+        pick = {
+            RANDOM: Random(f'{unit["colors"]}:{unit["pins"]}:{unit["repeat"]}:{n}').choice,
+            FIRST: lambda remaining_codes: remaining_codes[0],
+        }[strategy]
+        rounds[crack(codes[n], codes, pick)] += 1
+    return {'unit': unit['unit'], 'rounds': {str(k): v for k, v in rounds.items()}}
+
+
+def run_worker(address: str, strategy: str) -> None:
+    host, _, port = address.rpartition(':')
+    with socket.create_connection((host or LOCALHOST, int(port))) as conn, conn.makefile('rw') as stream:
+        for line in stream:
+            stream.write(json.dumps(work(json.loads(line), strategy)) + '\n')
+            stream.flush()
+
+
+def make_units(colors: List[int], pins: List[int], repeat: List[bool], chunk: int) -> List[Unit]:
+    units = []
+    for c, p, r in product(colors, pins, repeat):
+        total = c ** p if r else factorial(c) // factorial(c - p) if p <= c else 0
+        for start in range(0, total, chunk):
+            units.append({
+                'unit': len(units), 'colors': c, 'pins': p, 'repeat': r,
+                'start': start, 'stop': min(start + chunk, total),
+            })
+    return units
+
+
+def coordinate(units: List[Unit], *, workers: int, listen: str, strategy: str,
+               timeout: float) -> Dict[Tuple, Counter]:
+    def send_next(conn: socket.socket) -> None:
+        # a unit handed out again may have been done by the late worker in the meantime
+        while todo and todo[0]['unit'] in done:
+            todo.popleft()
+        if todo:
+            unit = todo.popleft()
+            busy[conn] = unit, monotonic() + timeout
+            conn.sendall((json.dumps(unit) + '\n').encode())
+        else:
+            busy[conn] = None
+
+    def hand_out_again(unit: Unit, reason: str) -> None:
+        if unit['unit'] not in done and unit not in todo:
+            todo.appendleft(unit)
+            print(f'+ {reason}, unit {unit["unit"]} handed out again.')
+
+    def drop(conn: socket.socket, reason: str = 'Worker lost') -> None:
+        unit, _ = busy.pop(conn, None) or (None, None)
+        if unit is not None:
+            hand_out_again(unit, reason)
+        buffers.pop(conn, None)
+        selector.unregister(conn)
+        conn.close()
+
+    def merge(conn: socket.socket, result: Unit) -> None:
+        unit, _ = busy[conn]
+        if result['unit'] != unit['unit']:
+            raise ValueError(f'result for unit {result["unit"]}, but unit {unit["unit"]} was sent')
+        rounds = Counter({int(k): int(v) for k, v in result['rounds'].items()})
+        if unit['unit'] in done:
+            return
+        done.add(unit['unit'])
+        report[(unit['colors'], unit['pins'], unit['repeat'])].update(rounds)
+
+    def check_deadlines() -> None:
+        now = monotonic()
+        for conn, (unit, deadline) in [(conn, job) for conn, job in busy.items() if job is not None]:
+            if deadline is not None and now > deadline:
+                # the late worker keeps its connection, a late result for a done unit is ignored
+                busy[conn] = unit, None
+                hand_out_again(unit, 'Worker too slow')
+
+    report = {(u['colors'], u['pins'], u['repeat']): Counter() for u in units}
+    todo, done, busy, buffers = deque(units), set(), {}, {}
+
+    host, _, port = listen.rpartition(':')
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((host or LOCALHOST, int(port or 0)))
+    server.listen()
+    address = '{}:{}'.format(*server.getsockname())
+    print(f'+ Coordinator listening on {address}, {len(units)} units to do.')
+
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ)
+    processes = [
+        subprocess.Popen([sys.executable, __file__, '--worker', address, '--strategy', strategy])
+        for _ in range(workers)
+    ]
+    try:
+        while len(done) < len(units):
+            if not busy and workers and all(p.poll() is not None for p in processes):
+                raise RuntimeError(f'All workers are gone, {len(units) - len(done)} units not done.')
+            for key, _ in selector.select(timeout=1.0):
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    selector.register(conn, selectors.EVENT_READ)
+                    buffers[conn] = b''
+                    send_next(conn)
+                    continue
+                conn = key.fileobj
+                try:
+                    data = conn.recv(BUFSIZE)
+                except ConnectionError:
+                    data = b''
+                if not data:
+                    drop(conn)
+                    continue
+                *lines, buffers[conn] = (buffers[conn] + data).split(b'\n')
+                for line in lines:
+                    try:
+                        merge(conn, json.loads(line))
+                    except (ValueError, TypeError, KeyError, AttributeError) as e:
+                        drop(conn, f'Bad result from worker ({e!r})')
+                        break
+                    send_next(conn)
+            check_deadlines()
+            for conn in [conn for conn, job in busy.items() if job is None and todo]:
+                send_next(conn)
+    finally:
+        for conn in list(buffers):
+            drop(conn)
+        selector.close()
+        server.close()
+        for p in processes:
+            try:
+                p.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                p.kill()
+                p.wait()
+    return report
+
+
+def show_report(report: Dict[Tuple, Counter]) -> None:
+    for (colors, pins, repeat), rounds in report.items():
+        games = sum(rounds.values())
+        if not games:
+            continue
+        mean = sum(k * v for k, v in rounds.items()) / games
+        histogram = ' '.join(f'{k}:{v}' for k, v in sorted(rounds.items()))
+        print(f'colors={colors} pins={pins} repeat={str(repeat).lower()}: '
+              f'{games} codes, {mean:.3f} guesses on average, {max(rounds)} at most | {histogram}')
+
+
+def parse_args():
+    parser = ArgumentParser(description='Sweep the settings like a mastermind!', usage='%(prog)s [options]')
+    parser.add_argument('--colors', type=int, nargs='+', default=[6, 7, 8, 9],
+                        help='the numbers of different colors to sweep (default = 6 7 8 9)')
+    parser.add_argument('--pins', type=int, nargs='+', default=[4, 5],
+                        help='the numbers of code pins to sweep (default = 4 5)')
+    parser.add_argument('--repeat', nargs='+', default=['true', 'false'], choices=['true', 'false'],
+                        help='sweep codes with or without repeated colors (default = true false)')
+    parser.add_argument('--strategy', default=RANDOM, choices=[RANDOM, FIRST],
+                        help='how to pick the next guess from the remaining codes (default = random)')
+    parser.add_argument('--chunk', type=int, default=500, help='secret codes per unit of work (default = 500)')
+    parser.add_argument('--workers', type=int, default=4, help='local worker processes to start (default = 4)')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='seconds until a unit of work is handed out again (default = 600)')
+    parser.add_argument('--listen', default=f'{LOCALHOST}:0',
+                        help='coordinator address as host:port (default = any free port on localhost)')
+    parser.add_argument('--worker', metavar='HOST:PORT', help='run as a worker for the given coordinator')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.worker:
+        run_worker(args.worker, args.strategy)
+        sys.exit(0)
+    if args.chunk < 1 or args.workers < 0 or args.timeout <= 0 or min(args.colors + args.pins) < 1:
+        print('Bad settings: chunk, timeout, colors and pins must be positive, workers must not be negative.')
+        sys.exit(4)
+    try:
+        show_report(coordinate(
+            make_units(args.colors, args.pins, [r == 'true' for r in args.repeat], args.chunk),
+            workers=args.workers,
+            listen=args.listen,
+            strategy=args.strategy,
+            timeout=args.timeout,
+        ))
+    except (RuntimeError, KeyboardInterrupt) as e:
+        print(f'*** Sweep aborted. {e}')
+        sys.exit(12)
+
+# last line of code
@@ -0,0 +1,79 @@
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+MAIN = Path(__file__).resolve().parent.parent / 'main'
+sys.path.insert(0, str(MAIN))
+
+from guess_a_number import SuperHirn  # noqa: E402
+
+
+class SuperHirnTest(unittest.TestCase):
+    def setUp(self):
+        self.app = SuperHirn()
+        self.app.board = []
+        self.output = io.StringIO()
+
+    def onecmd(self, line: str) -> bool:
+        with redirect_stdout(self.output):
+            return self.app.onecmd(line)
+
+    def start_codebreaker(self):
+        self.onecmd('set colors 6')
+        self.onecmd('set budget 0')
+        self.onecmd('codebreaker')
+
+    def test_set_budget(self):
+        self.onecmd('set budget 10')
+        self.assertEqual(self.app.settings['budget'], 10)
+        for value in ('61', '²', '-1', 'x'):
+            self.onecmd(f'set budget {value}')
+            self.assertEqual(self.app.settings['budget'], 10)
+
+    def test_feedback_leaving_no_code_ends_game(self):
+        self.start_codebreaker()
+        self.app.remaining_codes = [(0, 0, 0, 0)]
+        self.app.secret_code = (1, 1, 1, 1)
+        self.onecmd('feedback +')
+        self.assertEqual(self.app.remaining_codes, [])
+        self.assertTrue(self.app.game_over)
+        self.assertFalse(self.app.cracked)
+        self.assertIn('No code fits all the feedbacks', self.output.getvalue())
+
+    def test_next_guess_without_budget(self):
+        self.start_codebreaker()
+        self.output = io.StringIO()
+        with redirect_stdout(self.output):
+            guess = self.app.calculate_next_guess()
+        self.assertIn(guess, self.app.remaining_codes)
+        self.assertEqual(self.output.getvalue(), '')
+
+    def test_interrupted_filtering_leaves_session_unchanged(self):
+        def interrupt(a, b):
+            raise KeyboardInterrupt
+
+        self.start_codebreaker()
+        self.onecmd('feedback o')
+        guesses, board, remaining_codes = self.app.guesses, self.app.board[:], self.app.remaining_codes[:]
+        self.app.score = interrupt
+        self.onecmd('feedback o')
+        self.assertEqual(self.app.guesses, guesses)
+        self.assertEqual(self.app.board, board)
+        self.assertEqual(self.app.remaining_codes, remaining_codes)
+        self.assertIn('Command cancelled', self.output.getvalue())
+
+    def test_progress_hook(self):
+        reports = []
+        self.start_codebreaker()
+        self.app.chunk_size = 100
+        self.app.progress = lambda task, fraction: reports.append((task, fraction))
+        self.onecmd('feedback o')
+        self.assertEqual(reports[-1], ('Filtering codes', 1.0))
+        fractions = [fraction for _, fraction in reports]
+        self.assertEqual(fractions, sorted(fractions))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import unittest
+from pathlib import Path
+
+MAIN = Path(__file__).resolve().parent.parent / 'main'
+sys.path.insert(0, str(MAIN))
+
+import guess_a_number_replay as replay  # noqa: E402
+
+
+def replay_log(log: str):
+    """Return (settings, problems) for every game of the log, with the problems from reading and replaying."""
+    games = []
+    for start, settings, moves, problem in replay.read_games(log.splitlines()):
+        problems = [problem[1]] if problem else []
+        problems += [p for _, _, _, p in replay.replay(settings, moves) if p]
+        games.append((settings, problems))
+    return games
+
+
+class ParseSettingsTest(unittest.TestCase):
+    def test_defaults(self):
+        self.assertEqual(replay.parse_settings([]), replay.DEFAULTS)
+
+    def test_bad_settings(self):
+        for argv in (['colors=11'], ['pins=6'], ['colors=0'], ['colors=²'], ['colors=x'],
+                     ['repeat=yes'], ['speed=1'], ['colors=4', 'pins=5', 'repeat=false']):
+            self.assertIsNone(replay.parse_settings(argv), argv)
+
+    def test_bad_moves(self):
+        for argv in (['1', '2', '3', '²', 'o'], ['1', '2', '3', '4', 'x'], ['o']):
+            self.assertIsNone(replay.parse_move(argv), argv)
+
+
+class ReplayTest(unittest.TestCase):
+    def test_cracked(self):
+        [(settings, problems)] = replay_log('game colors=6\n0 0 1 1 o\n2 2 3 3 +\n1 4 3 5 ++++\n')
+        self.assertEqual(settings['colors'], 6)
+        self.assertEqual(problems, [])
+
+    def test_inconsistent_feedback(self):
+        [(_, problems)] = replay_log('game colors=6\n0 0 0 0 +\n0 0 0 0 -\n')
+        self.assertEqual(problems, ['inconsistent feedback, no code left'])
+
+    def test_bad_move_part_way(self):
+        log = 'game colors=6\n0 0 1 1 o\nx y\n1 4 3 5 o+\n2 2 2 2 -\n'
+        [(settings, problems)] = replay_log(log)
+        moves = list(replay.read_games(log.splitlines()))[0][2]
+        self.assertEqual(len(moves), 1)
+        self.assertEqual(problems, ['bad move: x y (2 moves after it skipped)'])
+        self.assertEqual(len(list(replay.replay(settings, moves))), 1)
+
+    def test_bad_settings(self):
+        [(settings, problems)] = replay_log('game pins=9 colors=9\n1 2 3 4 5 6 7 8 0 o\n')
+        self.assertIsNone(settings)
+        self.assertEqual(problems, ['bad settings: game pins=9 colors=9 (1 moves after it skipped)'])
+
+    def test_move_after_cracked(self):
+        [(_, problems)] = replay_log('game\n0 1 2 3 ++++\n4 4 4 4 -\n5 5 5 5 o\n')
+        self.assertEqual(problems, ['move after the code was cracked'])
+
+    def test_move_outside_of_a_game(self):
+        self.assertEqual(replay_log('1 2 3 4 o\n'), [(None, ['move outside of a game'])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from collections import Counter
+from pathlib import Path
+
+MAIN = Path(__file__).resolve().parent.parent / 'main'
+sys.path.insert(0, str(MAIN))
+
+import guess_a_number_sweep as sweep  # noqa: E402
+
+
+def free_address() -> str:
+    with socket.socket() as s:
+        s.bind((sweep.LOCALHOST, 0))
+        return '{}:{}'.format(*s.getsockname())
+
+
+def connect(address: str) -> socket.socket:
+    host, _, port = address.rpartition(':')
+    for _ in range(100):
+        try:
+            return socket.create_connection((host, int(port)))
+        except ConnectionRefusedError:
+            time.sleep(0.1)
+    raise ConnectionRefusedError(address)
+
+
+def read_line(conn: socket.socket) -> bytes:
+    data = b''
+    while not data.endswith(b'\n'):
+        data += conn.recv(sweep.BUFSIZE)
+    return data
+
+
+class MakeUnitsTest(unittest.TestCase):
+    def test_units_cover_all_codes(self):
+        units = sweep.make_units([6, 9], [4, 5], [True, False], 1000)
+        for colors, pins, repeat in [(6, 4, True), (6, 4, False), (9, 5, True), (9, 5, False)]:
+            self.assertEqual(
+                sum(u['stop'] - u['start'] for u in units if (u['colors'], u['pins'], u['repeat']) == (colors, pins, repeat)),
+                len(sweep.possible_codes(colors, pins, repeat)),
+            )
+
+    def test_no_units_for_more_pins_than_colors(self):
+        self.assertEqual(sweep.make_units([4], [5], [False], 10), [])
+
+
+class CoordinateTest(unittest.TestCase):
+    def test_lost_stalled_and_bad_workers(self):
+        units = sweep.make_units([4], [3], [True, False], 4)
+        expected = {(u['colors'], u['pins'], u['repeat']): Counter() for u in units}
+        for u in units:
+            rounds = sweep.work(u, sweep.RANDOM)['rounds']
+            expected[(u['colors'], u['pins'], u['repeat'])].update({int(k): v for k, v in rounds.items()})
+
+        address = free_address()
+        result = {}
+        coordinator = threading.Thread(
+            target=lambda: result.update(report=sweep.coordinate(
+                units, workers=0, listen=address, strategy=sweep.RANDOM, timeout=1)),
+            daemon=True,
+        )
+        coordinator.start()
+
+        lost, stalled, confused = connect(address), connect(address), connect(address)
+        for conn in (lost, stalled, confused):
+            read_line(conn)
+        lost.close()
+        confused.sendall(b'this is not json\n')
+        worker = subprocess.Popen(
+            [sys.executable, str(MAIN / 'guess_a_number_sweep.py'), '--worker', address],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            coordinator.join(timeout=60)
+            self.assertFalse(coordinator.is_alive())
+            self.assertEqual(result['report'], expected)
+        finally:
+            stalled.close()
+            confused.close()
+            worker.wait(timeout=10)
+
+    def test_late_result_is_not_handed_out_again(self):
+        units = sweep.make_units([4], [3], [True], 32)
+        address = free_address()
+        coordinator = threading.Thread(
+            target=sweep.coordinate, args=(units,),
+            kwargs=dict(workers=0, listen=address, strategy=sweep.RANDOM, timeout=0.5),
+            daemon=True,
+        )
+        coordinator.start()
+
+        with connect(address) as slow:
+            received = [json.loads(read_line(slow))['unit']]
+            time.sleep(2)
+            for unit in units:
+                slow.sendall((json.dumps(sweep.work(unit, sweep.RANDOM)) + '\n').encode())
+                if unit is not units[-1]:
+                    received.append(json.loads(read_line(slow))['unit'])
+            coordinator.join(timeout=10)
+        self.assertFalse(coordinator.is_alive())
+        self.assertEqual(received, [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()